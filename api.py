@@ -1,6 +1,9 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from pydantic import BaseModel
+from typing import Literal, Optional
 from src.rag_engine import RAGService
+from src.admission import OverloadedError, Priority
+from src.config import Config
 from src.logger import setup_logger
 import uvicorn
 import time
@@ -39,6 +42,7 @@ except Exception as e:
 # Modelo de dados para a requisição
 class QueryRequest(BaseModel):
     question: str
+    priority: Literal["interactive", "batch"] = "interactive"
 
 # Modelo de resposta
 class QueryResponse(BaseModel):
@@ -49,6 +53,15 @@ def read_root():
     logger.info("Endpoint raiz acessado.")
     return {"status": "online", "message": "Bem-vindo à API RAG. Use o endpoint /query para fazer perguntas."}
 
+@app.get("/health")
+def health():
+    """
+    Readiness: só responde 200 quando os modelos já estão carregados no Ollama.
+    """
+    if rag_service is None or not rag_service.is_ready:
+        raise HTTPException(status_code=503, detail="Serviço RAG ainda não está pronto.")
+    return {"status": "ready"}
+
 @app.post("/query", response_model=QueryResponse)
 def query_endpoint(request: QueryRequest):
     """
@@ -64,28 +77,61 @@ def query_endpoint(request: QueryRequest):
     
     logger.info(f"Processando query: {request.question[:50]}...")
     try:
-        response = rag_service.query(request.question)
+        priority = Priority.BATCH if request.priority == "batch" else Priority.INTERACTIVE
+        response = rag_service.query(request.question, priority=priority)
         return QueryResponse(answer=response)
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         logger.error(f"Erro ao processar query: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics")
+def metrics():
+    """
+    Métricas do controle de admissão (vagas ocupadas, fila e tempo de espera)
+    e taxa de acerto dos caches de reescrita e de embeddings.
+    """
+    if rag_service is None:
+        raise HTTPException(status_code=503, detail="Serviço RAG indisponível.")
+    return {"admission": rag_service.admission.stats(), "caches": rag_service.cache_stats()}
+
 @app.post("/reload")
-def reload_index():
+def reload_index(warm: Optional[bool] = None):
     """
     Recarrega o índice vetorial (útil após nova ingestão de dados).
+    Com `warm=true`, pré-aquece o cache em segundo plano com as perguntas mais frequentes.
     """
     if rag_service is None:
          raise HTTPException(status_code=503, detail="Serviço RAG indisponível.")
          
     logger.info("Endpoint /reload acessado.")
+    prewarm = Config.CACHE_PREWARM_ON_RELOAD if warm is None else warm
     try:
-        rag_service.reload_index()
-        return {"status": "success", "message": "Índice recarregado com sucesso."}
+        rag_service.reload_index(prewarm=prewarm)
+        return {"status": "success", "message": "Índice recarregado com sucesso.", "prewarm": prewarm}
     except Exception as e:
         logger.error(f"Erro ao recarregar índice: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/warmup")
+def warmup(limit: int = Query(Config.CACHE_PREWARM_TOP_N, ge=1)):
+    """
+    Pré-aquece o cache em segundo plano com as perguntas mais frequentes dos logs.
+    """
+    if rag_service is None:
+        raise HTTPException(status_code=503, detail="Serviço RAG indisponível.")
+
+    logger.info("Endpoint /warmup acessado.")
+    started = rag_service.cache_warmer.start(limit)
+    if not started:
+        return {"status": "running", "message": "Pré-aquecimento já em andamento."}
+    return {"status": "started", "message": f"Pré-aquecendo as {limit} perguntas mais frequentes."}
+
 if __name__ == "__main__":
     logger.info("Iniciando servidor Uvicorn...")
     uvicorn.run(app, host="0.0.0.0", port=8000)
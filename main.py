@@ -1,6 +1,9 @@
 import sys
+import httpx
+from src.config import Config
 from src.rag_engine import RAGService
 from src.ingestor import IngestionService
+from src.cache_warmer import mine_frequent_questions
 
 def print_help():
     print("""
@@ -11,6 +14,7 @@ def print_help():
     chat            -> Inicia o chat interativo (modo padrão)
     ingest          -> Processa os documentos e atualiza o banco vetorial
     query "pergunta" -> Faz uma pergunta única e sai
+    warmup [N]      -> Pré-aquece o cache da API com as N perguntas mais frequentes dos logs
     """)
 
 def run_chat():
@@ -39,6 +43,24 @@ def run_ingest():
     service = IngestionService()
     service.ingest_documents()
 
+def run_warmup(limit: int):
+    questions = mine_frequent_questions(limit)
+    if not questions:
+        print("Nenhuma pergunta encontrada nos logs.")
+        return
+
+    print(f"Perguntas mais frequentes ({len(questions)}):")
+    for i, question in enumerate(questions, 1):
+        print(f"  {i}. {question}")
+
+    # O cache vive no processo da API, então o pré-aquecimento é feito por ela
+    try:
+        response = httpx.post(f"{Config.API_URL}/warmup", params={"limit": limit}, timeout=10)
+        response.raise_for_status()
+        print(response.json()["message"])
+    except httpx.HTTPError as e:
+        print(f"Erro ao acionar o pré-aquecimento na API ({Config.API_URL}): {e}")
+
 def main():
     if len(sys.argv) < 2:
         run_chat()
@@ -56,6 +78,13 @@ def main():
             return
         rag = RAGService()
         print(rag.query(sys.argv[2]))
+    elif command == "warmup":
+        if len(sys.argv) > 2 and not (sys.argv[2].isdigit() and int(sys.argv[2]) > 0):
+            print("Erro: N deve ser um número inteiro positivo.")
+            print_help()
+            return
+        limit = int(sys.argv[2]) if len(sys.argv) > 2 else Config.CACHE_PREWARM_TOP_N
+        run_warmup(limit)
     else:
         print_help()
 
@@ -0,0 +1,190 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Optional
+from src.config import Config
+from src.logger import setup_logger
+
+logger = setup_logger("Admission")
+
+
+class Priority(IntEnum):
+    """Prioridade na fila de espera (menor valor é atendido primeiro)."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class OverloadedError(Exception):
+    """Requisição rejeitada por sobrecarga, com sugestão de Retry-After em segundos."""
+
+    def __init__(self, message: str, retry_after: int, queue_full: bool):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.queue_full = queue_full
+
+    @property
+    def status_code(self) -> int:
+        # Fila cheia: o cliente deve diminuir o ritmo (429). Prazo estourado: serviço saturado (503).
+        return 429 if self.queue_full else 503
+
+
+class AdmissionController:
+    """Limita as chamadas simultâneas ao Ollama, com fila de espera limitada e prioridades.
+
+    Requisições que não conseguem uma vaga dentro do prazo são rejeitadas
+    imediatamente em vez de ficarem acumuladas na fila do Ollama.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = Config.MAX_CONCURRENT_REQUESTS,
+        max_queue: int = Config.ADMISSION_QUEUE_SIZE,
+        timeout: float = Config.ADMISSION_TIMEOUT
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        self._waiting = []  # heap de (prioridade, ordem de chegada)
+        self._counter = itertools.count()
+        self._evicted = set()  # tickets BATCH removidos da fila para dar vaga a INTERACTIVE
+        self._in_flight = 0
+
+        # Métricas
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_deadline = 0
+        self._evictions = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._max_queue_depth = 0
+        self._avg_service_time: Optional[float] = None
+
+    def _estimated_wait(self, position: int) -> float:
+        """Estima quanto tempo a requisição na posição dada da fila vai esperar."""
+        if self._avg_service_time is None:
+            return 0.0
+        return (position // self.max_concurrency + 1) * self._avg_service_time
+
+    def _queue_position(self, priority: Priority) -> int:
+        """Quantas requisições na fila serão atendidas antes de uma nova com esta prioridade."""
+        return sum(1 for t in self._waiting if t[0] <= int(priority))
+
+    def _retry_after(self, priority: Priority) -> int:
+        return max(1, math.ceil(self._estimated_wait(self._queue_position(priority))))
+
+    def _reject(self, message: str, queue_full: bool, priority: Priority) -> OverloadedError:
+        if queue_full:
+            self._rejected_queue_full += 1
+        else:
+            self._rejected_deadline += 1
+        logger.warning(f"Requisição rejeitada: {message}")
+        return OverloadedError(message, self._retry_after(priority), queue_full)
+
+    def _acquire(self, priority: Priority, timeout: float) -> float:
+        start = time.monotonic()
+        deadline = start + timeout
+
+        with self._cond:
+            if self._in_flight < self.max_concurrency and not self._waiting:
+                self._in_flight += 1
+                self._record_admission(0.0)
+                return 0.0
+
+            if len(self._waiting) >= self.max_queue and not (
+                priority == Priority.INTERACTIVE and self._evict_newest_batch()
+            ):
+                raise self._reject(f"fila de espera cheia ({self.max_queue}).", queue_full=True, priority=priority)
+
+            # Só contam as requisições que a fila atenderá antes desta (mesma prioridade ou maior)
+            if self._estimated_wait(self._queue_position(priority)) > timeout:
+                raise self._reject("tempo de espera estimado excede o prazo.", queue_full=False, priority=priority)
+
+            ticket = (int(priority), next(self._counter))
+            heapq.heappush(self._waiting, ticket)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._waiting))
+
+            while True:
+                if ticket in self._evicted:
+                    # Já removido da fila por _evict_newest_batch
+                    self._evicted.discard(ticket)
+                    raise self._reject("vaga na fila cedida a uma requisição interativa.", queue_full=True, priority=priority)
+                if self._in_flight < self.max_concurrency and self._waiting[0] == ticket:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                    raise self._reject(f"nenhuma vaga liberada em {timeout:.0f}s.", queue_full=False, priority=priority)
+                self._cond.wait(remaining)
+
+            heapq.heappop(self._waiting)
+            self._in_flight += 1
+            waited = time.monotonic() - start
+            self._record_admission(waited)
+            # Pode haver mais vagas livres para o próximo da fila
+            self._cond.notify_all()
+            return waited
+
+    def _evict_newest_batch(self) -> bool:
+        """Remove da fila o BATCH que chegou por último; ele é acordado e recebe 429."""
+        batch = [t for t in self._waiting if t[0] == Priority.BATCH]
+        if not batch:
+            return False
+        newest = max(batch, key=lambda t: t[1])
+        self._waiting.remove(newest)
+        heapq.heapify(self._waiting)
+        self._evicted.add(newest)
+        self._evictions += 1
+        self._cond.notify_all()
+        return True
+
+    def _record_admission(self, waited: float):
+        self._admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def _release(self, service_time: float):
+        with self._cond:
+            self._in_flight -= 1
+            # Média móvel exponencial do tempo de atendimento, usada nas estimativas de espera
+            if self._avg_service_time is None:
+                self._avg_service_time = service_time
+            else:
+                self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * service_time
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: Priority = Priority.INTERACTIVE, timeout: Optional[float] = None):
+        """Ocupa uma vaga durante o bloco; lança OverloadedError se não conseguir a tempo."""
+        waited = self._acquire(priority, self.timeout if timeout is None else timeout)
+        if waited > 0:
+            logger.info(f"Vaga obtida após {waited:.2f}s na fila ({priority.name}).")
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - start)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "queue_depth": len(self._waiting),
+                "max_queue_depth": self._max_queue_depth,
+                "queue_size": self.max_queue,
+                "admitted": self._admitted,
+                "rejected_queue_full": self._rejected_queue_full,
+                "rejected_deadline": self._rejected_deadline,
+                "evicted_batch": self._evictions,
+                "avg_wait_seconds": self._total_wait / self._admitted if self._admitted else 0.0,
+                "max_wait_seconds": self._max_wait,
+                "avg_service_seconds": self._avg_service_time or 0.0,
+            }
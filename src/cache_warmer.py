@@ -0,0 +1,111 @@
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+from src.admission import OverloadedError, Priority
+from src.config import Config
+from src.logger import setup_logger, LOG_DIR
+
+logger = setup_logger("CacheWarmer")
+
+# Linha registrada por RAGService.query para cada pergunta recebida
+QUESTION_PATTERN = re.compile(r"Recebendo pergunta: '(.*)'$")
+
+
+def _log_files() -> List[str]:
+    """Retorna o app.log e os arquivos já rotacionados (app.log.1, app.log.2, ...)."""
+    base = os.path.join(LOG_DIR, "app.log")
+    paths = [base]
+    index = 1
+    while os.path.exists(f"{base}.{index}"):
+        paths.append(f"{base}.{index}")
+        index += 1
+    return [p for p in paths if os.path.exists(p)]
+
+
+def mine_frequent_questions(limit: int = Config.CACHE_PREWARM_TOP_N) -> List[str]:
+    """Extrai as perguntas mais frequentes dos logs e do arquivo de histórico (uma por linha)."""
+    counter = Counter()
+
+    for path in _log_files():
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                match = QUESTION_PATTERN.search(line.rstrip("\n"))
+                if match and match.group(1).strip():
+                    counter[match.group(1)] += 1
+
+    if Config.QUERY_HISTORY_FILE and os.path.exists(Config.QUERY_HISTORY_FILE):
+        with open(Config.QUERY_HISTORY_FILE, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.strip():
+                    counter[line.strip()] += 1
+
+    questions = [question for question, _ in counter.most_common(limit)]
+    logger.info(f"{len(questions)} perguntas frequentes encontradas ({len(counter)} distintas no histórico).")
+    return questions
+
+
+class CacheWarmer:
+    """Pré-calcula em segundo plano as respostas das perguntas mais frequentes.
+
+    As perguntas são enviadas uma a uma com prioridade BATCH, de forma que o
+    tráfego interativo sempre passa na frente no controle de admissão.
+    """
+
+    def __init__(self, rag_service):
+        self.rag = rag_service
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def warm(self, questions: List[str], stop_event: Optional[threading.Event] = None) -> int:
+        """Responde as perguntas dadas para popular o cache. Retorna quantas foram aquecidas."""
+        stop_event = stop_event or threading.Event()
+        warmed = 0
+        for question in questions:
+            # Repete a mesma pergunta após uma rejeição por sobrecarga, até conseguir ou ser interrompido
+            while not stop_event.is_set():
+                try:
+                    self.rag.query(question, priority=Priority.BATCH, prewarm=True)
+                    warmed += 1
+                    break
+                except OverloadedError as e:
+                    # Serviço ocupado com tráfego real: espera em vez de competir por vagas
+                    logger.info(f"Serviço sobrecarregado, pausando pré-aquecimento por {e.retry_after}s.")
+                    stop_event.wait(e.retry_after)
+                except Exception as e:
+                    logger.warning(f"Falha ao pré-aquecer pergunta '{question}': {str(e)}")
+                    break
+            if stop_event.is_set():
+                logger.info("Pré-aquecimento interrompido.")
+                break
+        return warmed
+
+    def _run(self, limit: int, stop_event: threading.Event):
+        start_time = time.time()
+        questions = mine_frequent_questions(limit)
+        warmed = self.warm(questions, stop_event)
+        logger.info(f"Cache pré-aquecido com {warmed}/{len(questions)} perguntas em {time.time() - start_time:.2f}s.")
+
+    def start(self, limit: int = Config.CACHE_PREWARM_TOP_N) -> bool:
+        """Inicia o pré-aquecimento em segundo plano. Retorna False se já houver um em andamento."""
+        if self.running and not self._stop_event.is_set():
+            logger.info("Pré-aquecimento já em andamento.")
+            return False
+        # Cada execução tem seu próprio evento: uma execução interrompida pode terminar
+        # a pergunta atual enquanto a nova já começa.
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(limit, self._stop_event), name="cache-warmer", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Interrompe o pré-aquecimento em andamento (a pergunta atual ainda termina)."""
+        self._stop_event.set()
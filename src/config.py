@@ -10,16 +10,62 @@ class Config:
     EMBEDDING_MODEL = "nomic-embed-text"
     LLM_MODEL = "gemma3:4b"
     
+    # Ollama
+    OLLAMA_BASE_URL = "http://localhost:11434"
+    OLLAMA_TIMEOUT = 120  # segundos por requisição HTTP
+    OLLAMA_MAX_CONNECTIONS = 10  # tamanho do pool HTTP compartilhado
+    OLLAMA_KEEP_ALIVE = 1800  # segundos que o Ollama mantém os modelos carregados (int: exigido pelo OllamaEmbeddings)
+    LLM_NUM_CTX = 4096
+    EMBEDDING_NUM_CTX = 2048
+    WARMUP_ON_START = True  # carrega os modelos em segundo plano na inicialização do serviço
+    WARMUP_RETRY_INTERVAL = 2  # segundos até a primeira nova tentativa de warm-up (dobra a cada falha)
+    WARMUP_RETRY_MAX_INTERVAL = 30  # intervalo máximo entre tentativas de warm-up
+    KEEP_ALIVE_PING_INTERVAL = 600  # segundos entre pings (0 desativa); deve ser menor que o keep_alive
+    
     # Parâmetros de Ingestão
     CHUNK_SIZE = 1000
     CHUNK_OVERLAP = 200
     
+    # Deduplicação de chunks (hash exato + MinHash para quase duplicatas)
+    DEDUP_ENABLED = True
+    DEDUP_THRESHOLD = 0.85  # similaridade de Jaccard estimada para considerar quase duplicata
+    DEDUP_NUM_PERM = 128  # permutações do MinHash
+    DEDUP_BANDS = 32  # bandas do LSH (DEDUP_NUM_PERM deve ser múltiplo)
+    DEDUP_SHINGLE_SIZE = 5  # palavras por shingle
+    
     # Parâmetros de Busca
-    RETRIEVER_K = 3
+    RETRIEVER_K = 3  # máximo de chunks enviados ao LLM
+    RELEVANCE_THRESHOLD = 0.5  # similaridade de cosseno mínima para um chunk ser usado
+    RELEVANCE_DROP_OFF = 0.15  # descarta chunks muito abaixo do melhor resultado (k dinâmico)
+    
+    # Quantização do índice vetorial
+    VECTOR_QUANTIZATION = "none"  # "none", "sq8", "fp16" ou "pq"
+    VECTOR_REDUCED_DIM = None  # ex.: 256 para aplicar PCA antes da quantização
+    PQ_M = 64  # subquantizadores do PQ (deve dividir a dimensão final)
+    RESCORE_FACTOR = 4  # candidatos buscados no índice comprimido = k * fator
+    
+    # Controle de admissão (chamadas simultâneas ao Ollama)
+    MAX_CONCURRENT_REQUESTS = 2  # perguntas processadas ao mesmo tempo
+    ADMISSION_QUEUE_SIZE = 16  # máximo de perguntas aguardando vaga (excedente recebe 429)
+    ADMISSION_TIMEOUT = 30  # segundos máximos de espera por vaga (excedente recebe 503)
     
     # Cache
     CACHE_TTL = 3600  # 1 hora em segundos
     
+    # Caches LRU de reescritas e de embeddings de consultas (não são limpos ao recarregar o índice)
+    REWRITE_CACHE_SIZE = 1024
+    EMBEDDING_CACHE_SIZE = 4096
+    
+    # Pré-aquecimento do cache com as perguntas mais frequentes (logs/app.log e histórico)
+    QUERY_HISTORY_FILE = os.path.join(BASE_DIR, "query_history.txt")  # opcional, uma pergunta por linha
+    CACHE_PREWARM_TOP_N = 20
+    CACHE_PREWARM_ON_RELOAD = True
+    CACHE_PREWARM_ON_START = False
+    API_URL = "http://localhost:8000"  # usado pelo comando `python main.py warmup`
+    
+    # Resposta padrão quando nenhum chunk passa no limiar (não chama o LLM)
+    NOT_FOUND_ANSWER = "Não encontrei essa informação nos documentos disponíveis."
+    
     # Prompt
     REWRITE_PROMPT = """
     Reescreva a pergunta do usuário de forma mais clara e concisa.
@@ -0,0 +1,136 @@
+import hashlib
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import numpy as np
+from langchain_core.documents import Document
+from src.config import Config
+from src.logger import setup_logger
+
+logger = setup_logger("Dedup")
+
+# Primo de Mersenne usado nas permutações do MinHash (a * x + b) mod p
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+
+class ChunkDeduplicator:
+    """Remove chunks duplicados (hash exato) e quase duplicados (MinHash + LSH).
+
+    Mantém a primeira ocorrência como cópia canônica e acumula as fontes de todas
+    as cópias descartadas em metadata["sources"].
+    """
+
+    def __init__(
+        self,
+        threshold: float = Config.DEDUP_THRESHOLD,
+        num_perm: int = Config.DEDUP_NUM_PERM,
+        bands: int = Config.DEDUP_BANDS,
+        shingle_size: int = Config.DEDUP_SHINGLE_SIZE
+    ):
+        if num_perm % bands != 0:
+            raise ValueError(f"DEDUP_NUM_PERM ({num_perm}) deve ser múltiplo de DEDUP_BANDS ({bands}).")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(1)
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self.stats = {"total": 0, "exact": 0, "near": 0, "kept": 0}
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", text).strip().lower()
+
+    def _shingles(self, text: str) -> np.ndarray:
+        words = text.split(" ")
+        if len(words) <= self.shingle_size:
+            grams = {text}
+        else:
+            grams = {
+                " ".join(words[i:i + self.shingle_size])
+                for i in range(len(words) - self.shingle_size + 1)
+            }
+        return np.array([zlib.crc32(g.encode("utf-8")) for g in grams], dtype=np.uint64)
+
+    def _signature(self, text: str) -> np.ndarray:
+        hashes = self._shingles(text)
+        # Cada linha é uma permutação: min((a * x + b) mod p) sobre todos os shingles
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def _add_source(canonical: Document, duplicate: Document) -> None:
+        source = duplicate.metadata.get("source")
+        if source and source not in canonical.metadata["sources"]:
+            canonical.metadata["sources"].append(source)
+
+    def deduplicate(self, chunks: List[Document]) -> List[Document]:
+        """Retorna apenas os chunks canônicos, na ordem original."""
+        kept: List[Document] = []
+        signatures: List[np.ndarray] = []
+        exact_index: Dict[str, int] = {}
+        buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+        exact = near = 0
+
+        for chunk in chunks:
+            text = self._normalize(chunk.page_content)
+            digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+            if digest in exact_index:
+                self._add_source(kept[exact_index[digest]], chunk)
+                exact += 1
+                continue
+
+            signature = self._signature(text)
+            keys = self._band_keys(signature)
+
+            match = None
+            candidates = {idx for key in keys for idx in buckets.get(key, [])}
+            for idx in sorted(candidates):
+                # Similaridade de Jaccard estimada = fração de permutações iguais
+                if np.mean(signatures[idx] == signature) >= self.threshold:
+                    match = idx
+                    break
+
+            if match is not None:
+                self._add_source(kept[match], chunk)
+                exact_index[digest] = match
+                near += 1
+                continue
+
+            position = len(kept)
+            chunk.metadata["sources"] = [chunk.metadata["source"]] if chunk.metadata.get("source") else []
+            kept.append(chunk)
+            signatures.append(signature)
+            exact_index[digest] = position
+            for key in keys:
+                buckets[key].append(position)
+
+        self.stats = {"total": len(chunks), "exact": exact, "near": near, "kept": len(kept)}
+        logger.info(self.report())
+        return kept
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Fração dos chunks removidos por serem duplicados."""
+        if not self.stats["total"]:
+            return 0.0
+        return 1 - self.stats["kept"] / self.stats["total"]
+
+    def report(self) -> str:
+        return (
+            f"Deduplicação: {self.stats['kept']}/{self.stats['total']} chunks mantidos "
+            f"({self.stats['exact']} duplicatas exatas, {self.stats['near']} quase duplicatas, "
+            f"taxa de remoção {self.dedup_ratio:.1%})"
+        )
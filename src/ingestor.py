@@ -2,12 +2,14 @@ import os
 from langchain_community.document_loaders import DirectoryLoader, TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
-from langchain_ollama import OllamaEmbeddings
 from src.config import Config
+from src.quantization import quantize_vector_store
+from src.dedup import ChunkDeduplicator
+from src.ollama_client import create_embeddings
 
 class IngestionService:
     def __init__(self):
-        self.embeddings = OllamaEmbeddings(model=Config.EMBEDDING_MODEL)
+        self.embeddings = create_embeddings()
         
     def ingest_documents(self):
         """Carrega documentos, divide em chunks e cria/atualiza o índice vetorial."""
@@ -39,8 +41,15 @@ class IngestionService:
         chunks = splitter.split_documents(docs)
         print(f"{len(chunks)} chunks criados.")
         
+        if Config.DEDUP_ENABLED:
+            print("Removendo chunks duplicados...")
+            deduplicator = ChunkDeduplicator()
+            chunks = deduplicator.deduplicate(chunks)
+            print(deduplicator.report())
+        
         print("Gerando embeddings e salvando índice...")
         vector_store = FAISS.from_documents(chunks, self.embeddings)
+        quantize_vector_store(vector_store, Config.VECTOR_STORE_PATH)
         vector_store.save_local(Config.VECTOR_STORE_PATH)
         print(f"Índice salvo em {Config.VECTOR_STORE_PATH}")
         return True
@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List
+from langchain_core.embeddings import Embeddings
+
+
+class LRUCache:
+    """Cache LRU limitado e thread-safe, com contadores de acerto."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]):
+        """Retorna o valor em cache ou calcula, armazena e retorna um novo."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Calculado fora do lock para não serializar chamadas ao Ollama
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+class CachedEmbeddings(Embeddings):
+    """Memoriza os embeddings de consultas; embeddings de documentos não passam pelo cache."""
+
+    def __init__(self, embeddings: Embeddings, maxsize: int):
+        self.embeddings = embeddings
+        self.cache = LRUCache(maxsize)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.cache.get_or_compute(text, lambda: self.embeddings.embed_query(text))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
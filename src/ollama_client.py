@@ -0,0 +1,110 @@
+import threading
+from typing import Callable, Optional
+import httpx
+from ollama import Client
+from langchain_ollama import OllamaEmbeddings
+from langchain_ollama.llms import OllamaLLM
+from src.config import Config
+from src.logger import setup_logger
+
+logger = setup_logger("OllamaClient")
+
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+
+
+def get_shared_client() -> Client:
+    """Retorna o cliente Ollama compartilhado (um único pool de conexões HTTP por processo)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            logger.info(f"Criando cliente HTTP compartilhado para {Config.OLLAMA_BASE_URL}")
+            _client = Client(
+                host=Config.OLLAMA_BASE_URL,
+                timeout=Config.OLLAMA_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=Config.OLLAMA_MAX_CONNECTIONS,
+                    max_keepalive_connections=Config.OLLAMA_MAX_CONNECTIONS
+                )
+            )
+    return _client
+
+
+def _use_shared_client(model):
+    """Substitui o cliente síncrono do modelo LangChain pelo cliente compartilhado.
+
+    Depende de detalhes internos do langchain_ollama (1.0.x): o atributo privado
+    `_client`, criado em `_set_clients`. O cliente próprio já criado (e o
+    `_async_client`) continua existindo, mas o caminho síncrono usado aqui passa
+    a usar o pool compartilhado. O caminho assíncrono não é compartilhado.
+    """
+    private_attributes = getattr(type(model), "__private_attributes__", {})
+    if "_client" not in private_attributes:
+        raise RuntimeError(
+            f"{type(model).__name__} não possui o atributo privado '_client': a versão instalada do "
+            "langchain_ollama mudou e o cliente HTTP compartilhado não pode mais ser injetado."
+        )
+    model._client = get_shared_client()
+    return model
+
+
+def create_llm(**kwargs) -> OllamaLLM:
+    """Cria o LLM configurado usando o cliente HTTP compartilhado."""
+    llm = OllamaLLM(
+        model=Config.LLM_MODEL,
+        base_url=Config.OLLAMA_BASE_URL,
+        keep_alive=Config.OLLAMA_KEEP_ALIVE,
+        num_ctx=Config.LLM_NUM_CTX,
+        **kwargs
+    )
+    return _use_shared_client(llm)
+
+
+def create_embeddings() -> OllamaEmbeddings:
+    """Cria o modelo de embeddings configurado usando o cliente HTTP compartilhado."""
+    embeddings = OllamaEmbeddings(
+        model=Config.EMBEDDING_MODEL,
+        base_url=Config.OLLAMA_BASE_URL,
+        keep_alive=Config.OLLAMA_KEEP_ALIVE,
+        num_ctx=Config.EMBEDDING_NUM_CTX
+    )
+    return _use_shared_client(embeddings)
+
+
+def warm_up_models() -> None:
+    """Carrega o LLM e o modelo de embeddings na memória do Ollama (e renova o keep_alive)."""
+    client = get_shared_client()
+    # Um prompt vazio apenas carrega o modelo, sem gerar texto.
+    # O num_ctx deve ser o mesmo das chamadas reais para o Ollama não recarregar o modelo.
+    client.generate(
+        model=Config.LLM_MODEL,
+        prompt="",
+        keep_alive=Config.OLLAMA_KEEP_ALIVE,
+        options={"num_ctx": Config.LLM_NUM_CTX}
+    )
+    client.embed(
+        model=Config.EMBEDDING_MODEL,
+        input="warm-up",
+        keep_alive=Config.OLLAMA_KEEP_ALIVE,
+        options={"num_ctx": Config.EMBEDDING_NUM_CTX}
+    )
+
+
+class KeepAlivePinger(threading.Thread):
+    """Thread em segundo plano que chama `ping` periodicamente para manter os modelos carregados."""
+
+    def __init__(self, ping: Callable[[], object], interval: float = Config.KEEP_ALIVE_PING_INTERVAL):
+        super().__init__(name="ollama-keep-alive", daemon=True)
+        self.ping = ping
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.ping()
+            except Exception as e:
+                logger.warning(f"Falha no keep-alive do Ollama: {str(e)}")
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,143 @@
+import os
+from typing import List, Optional, Tuple
+import numpy as np
+import faiss
+from langchain_community.vectorstores import FAISS
+from src.config import Config
+from src.logger import setup_logger
+
+logger = setup_logger("Quantization")
+
+# Vetores float32 originais, gravados ao lado do índice comprimido para o rescoring exato
+FULL_VECTORS_FILE = "vectors.npy"
+
+# Número de centróides por subquantizador do PQ (códigos de 8 bits)
+PQ_CLUSTERS = 256
+# Mínimo de vetores de treino recomendado pelo FAISS para o k-means (39 pontos por centróide)
+PQ_MIN_TRAINING_POINTS = 39 * PQ_CLUSTERS
+
+
+def index_factory_string(method: str, reduced_dim: Optional[int] = None) -> str:
+    """Monta a string do faiss.index_factory para o método de quantização escolhido."""
+    prefix = f"PCA{reduced_dim}," if reduced_dim else ""
+    if method == "sq8":
+        return prefix + "SQ8"
+    if method == "fp16":
+        return prefix + "SQfp16"
+    if method == "pq":
+        return prefix + f"PQ{Config.PQ_M}"
+    raise ValueError(f"Método de quantização desconhecido: '{method}'. Use 'none', 'sq8', 'fp16' ou 'pq'.")
+
+
+def build_compressed_index(vectors: np.ndarray, method: str, reduced_dim: Optional[int] = None) -> faiss.Index:
+    """Treina e popula um índice comprimido (SQ/PQ, opcionalmente com PCA) com os vetores dados."""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    dim = reduced_dim or vectors.shape[1]
+
+    if method == "pq":
+        if dim % Config.PQ_M != 0:
+            raise ValueError(f"PQ_M={Config.PQ_M} deve dividir a dimensão {dim}.")
+        if len(vectors) < PQ_MIN_TRAINING_POINTS:
+            logger.warning(
+                f"Apenas {len(vectors)} vetores para treinar o PQ (mínimo {PQ_MIN_TRAINING_POINTS}). Usando 'sq8'."
+            )
+            method = "sq8"
+
+    factory = index_factory_string(method, reduced_dim)
+    logger.info(f"Construindo índice comprimido '{factory}' com {len(vectors)} vetores...")
+    index = faiss.index_factory(vectors.shape[1], factory, faiss.METRIC_L2)
+    index.train(vectors)
+    index.add(vectors)
+    return index
+
+
+def rescore(
+    index: faiss.Index,
+    full_vectors: np.ndarray,
+    query: np.ndarray,
+    k: int,
+    factor: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Busca k * factor candidatos no índice comprimido e reordena pela distância L2 exata.
+
+    Retorna (distâncias, posições), ambos com no máximo k elementos, no mesmo formato
+    do IndexFlatL2 (distância L2 ao quadrado).
+    """
+    query = np.asarray(query, dtype=np.float32).reshape(1, -1)
+    _, indices = index.search(query, k * factor)
+    candidates = indices[0][indices[0] != -1]
+    if len(candidates) == 0:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+
+    # Lê do disco apenas os vetores dos candidatos (full_vectors normalmente é um memmap)
+    exact = np.asarray(full_vectors[candidates], dtype=np.float32)
+    distances = ((exact - query) ** 2).sum(axis=1)
+    order = np.argsort(distances)[:k]
+    return distances[order], candidates[order]
+
+
+class RescoringFAISS(FAISS):
+    """FAISS com busca em duas fases: candidatos do índice comprimido e rescoring exato."""
+
+    full_vectors: Optional[np.ndarray] = None
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter=None,
+        fetch_k: int = 20,
+        **kwargs
+    ) -> List[Tuple]:
+        if self.full_vectors is None or filter is not None:
+            return super().similarity_search_with_score_by_vector(
+                embedding, k=k, filter=filter, fetch_k=fetch_k, **kwargs
+            )
+
+        distances, positions = rescore(self.index, self.full_vectors, embedding, k, Config.RESCORE_FACTOR)
+        results = []
+        for distance, position in zip(distances, positions):
+            doc = self.docstore.search(self.index_to_docstore_id[int(position)])
+            results.append((doc, float(distance)))
+        return results
+
+
+def quantize_vector_store(vector_store: FAISS, folder_path: str) -> None:
+    """Substitui o índice float32 do vector store pelo comprimido e grava os vetores originais."""
+    full_vectors_path = os.path.join(folder_path, FULL_VECTORS_FILE)
+
+    if Config.VECTOR_QUANTIZATION == "none":
+        # Evita que vetores de uma ingestão quantizada anterior sejam usados por engano
+        if os.path.exists(full_vectors_path):
+            os.remove(full_vectors_path)
+        return
+
+    vectors = vector_store.index.reconstruct_n(0, vector_store.index.ntotal)
+    vector_store.index = build_compressed_index(
+        vectors, Config.VECTOR_QUANTIZATION, Config.VECTOR_REDUCED_DIM
+    )
+    os.makedirs(folder_path, exist_ok=True)
+    np.save(full_vectors_path, vectors)
+    logger.info(
+        f"Índice quantizado ({Config.VECTOR_QUANTIZATION}): "
+        f"{vector_store.index.sa_code_size()} bytes/vetor contra {vectors.shape[1] * 4} no float32."
+    )
+
+
+def load_vector_store(folder_path: str, embeddings) -> FAISS:
+    """Carrega o índice do disco, ativando o rescoring exato quando o índice está quantizado."""
+    store = RescoringFAISS.load_local(
+        folder_path,
+        embeddings,
+        allow_dangerous_deserialization=True
+    )
+
+    full_vectors_path = os.path.join(folder_path, FULL_VECTORS_FILE)
+    if os.path.exists(full_vectors_path):
+        full_vectors = np.load(full_vectors_path, mmap_mode="r")
+        if full_vectors.shape[0] == store.index.ntotal:
+            store.full_vectors = full_vectors
+            logger.info("Índice quantizado detectado: rescoring exato ativado.")
+        else:
+            logger.warning(f"{FULL_VECTORS_FILE} não corresponde ao índice; rescoring desativado.")
+    return store
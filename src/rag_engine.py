@@ -1,13 +1,17 @@
 import os
+import threading
 import time
-from langchain_ollama.llms import OllamaLLM
+from typing import List
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_community.vectorstores import FAISS
-from langchain_ollama import OllamaEmbeddings
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.documents import Document
 from src.config import Config
 from src.logger import setup_logger, measure_time
+from src.quantization import load_vector_store
+from src.admission import AdmissionController, Priority
+from src.cache_warmer import CacheWarmer
+from src.memo import LRUCache, CachedEmbeddings
+from src.ollama_client import create_embeddings, create_llm, warm_up_models, KeepAlivePinger
 
 logger = setup_logger("RAGService")
 
@@ -30,20 +34,94 @@ class RAGService:
         
         # Inicializa o cache
         self._cache = {}
+        # Incrementado a cada recarga: respostas calculadas com o índice antigo não entram no cache
+        self._index_generation = 0
+        self.cache_warmer = CacheWarmer(self)
+        
+        # Só fica pronto depois que os modelos estiverem carregados no Ollama
+        self._ready = threading.Event()
+        self._warm_up_thread = None
+        self._pinger = None
+        # _on_ready roda só na primeira vez que o serviço fica pronto, não após cada queda do Ollama
+        self._ready_once = False
+        
+        # Limita as chamadas simultâneas ao Ollama (reescrita, embeddings e geração)
+        self.admission = AdmissionController()
         
         logger.info(f"Carregando embeddings: {Config.EMBEDDING_MODEL}")
-        self.embeddings = OllamaEmbeddings(model=Config.EMBEDDING_MODEL)
+        # Embeddings de consultas memorizados: não dependem do índice, sobrevivem às recargas
+        self.embeddings = CachedEmbeddings(create_embeddings(), Config.EMBEDDING_CACHE_SIZE)
         
         self.vector_store = self._load_vector_store()
         
         logger.info(f"Carregando LLM: {Config.LLM_MODEL}")
-        self.llm = OllamaLLM(model=Config.LLM_MODEL)
+        self.llm = create_llm()
         
         logger.info("Construindo Chain...")
         self.chain = self._build_chain()
+        self.rewrite_chain = ChatPromptTemplate.from_template(Config.REWRITE_PROMPT) | self.llm | StrOutputParser()
+        self._rewrite_cache = LRUCache(Config.REWRITE_CACHE_SIZE)
         
         self._initialized = True
         logger.info("RAG Service inicializado com sucesso.")
+        
+        if Config.WARMUP_ON_START:
+            # Em segundo plano: /health responde 503 até os modelos estarem carregados
+            self._start_warm_up()
+        else:
+            self._ready.set()
+            self._on_ready()
+        
+        if Config.KEEP_ALIVE_PING_INTERVAL > 0:
+            # Renova o keep_alive; se falhar, volta a tentar o warm-up até ficar pronto
+            self._pinger = KeepAlivePinger(self._keep_alive)
+            self._pinger.start()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def warm_up(self) -> bool:
+        """Carrega os modelos no Ollama antes das primeiras perguntas."""
+        try:
+            start_time = time.time()
+            warm_up_models()
+            if not self._ready.is_set():
+                logger.info(f"Modelos aquecidos em {time.time() - start_time:.2f}s. Serviço pronto.")
+                self._ready.set()
+            return True
+        except Exception as e:
+            logger.warning(f"Falha ao aquecer os modelos no Ollama: {str(e)}")
+            self._ready.clear()
+            return False
+
+    def _start_warm_up(self):
+        if self._warm_up_thread is not None and self._warm_up_thread.is_alive():
+            return
+        self._warm_up_thread = threading.Thread(
+            target=self._warm_up_until_ready, name="ollama-warm-up", daemon=True
+        )
+        self._warm_up_thread.start()
+
+    def _warm_up_until_ready(self):
+        """Tenta o warm-up com backoff exponencial até os modelos estarem carregados."""
+        delay = Config.WARMUP_RETRY_INTERVAL
+        while not self.warm_up():
+            logger.info(f"Nova tentativa de warm-up em {delay}s.")
+            time.sleep(delay)
+            delay = min(delay * 2, Config.WARMUP_RETRY_MAX_INTERVAL)
+        self._on_ready()
+
+    def _keep_alive(self):
+        if not self.warm_up() and Config.WARMUP_ON_START:
+            self._start_warm_up()
+
+    def _on_ready(self):
+        if self._ready_once:
+            return
+        self._ready_once = True
+        if Config.CACHE_PREWARM_ON_START:
+            self.cache_warmer.start()
 
     @measure_time
     def _load_vector_store(self):
@@ -52,36 +130,64 @@ class RAGService:
             logger.error(f"Índice FAISS não encontrado em {Config.VECTOR_STORE_PATH}")
             raise FileNotFoundError(f"Índice FAISS não encontrado em {Config.VECTOR_STORE_PATH}. Execute o ingestor primeiro.")
         
-        store = FAISS.load_local(
-            Config.VECTOR_STORE_PATH, 
-            self.embeddings, 
-            allow_dangerous_deserialization=True
-        )
+        store = load_vector_store(Config.VECTOR_STORE_PATH, self.embeddings)
         logger.info("Índice FAISS carregado.")
         return store
 
     def _build_chain(self):
-        retriever = self.vector_store.as_retriever(search_kwargs={"k": Config.RETRIEVER_K})
         prompt = ChatPromptTemplate.from_template(Config.RAG_TEMPLATE)
         parser = StrOutputParser()
         
-        return (
-            {"context": retriever, "question": RunnablePassthrough()}
-            | prompt
-            | self.llm
-            | parser
+        return prompt | self.llm | parser
+
+    @staticmethod
+    def _format_docs(docs: List[Document]) -> str:
+        return "\n\n".join(doc.page_content for doc in docs)
+
+    @measure_time
+    def retrieve(self, question: str) -> List[Document]:
+        """Busca os chunks mais similares e descarta os que não passam no limiar de relevância."""
+        results = self.vector_store.similarity_search_with_score(question, k=Config.RETRIEVER_K)
+        if not results:
+            return []
+        
+        # FAISS retorna a distância L2 ao quadrado; com embeddings normalizados, cosseno = 1 - d/2
+        scored = [(doc, 1 - float(distance) / 2) for doc, distance in results]
+        best = max(score for _, score in scored)
+        
+        # k dinâmico: corta quando a similaridade cai muito em relação ao melhor resultado
+        docs = [
+            doc for doc, score in scored
+            if score >= Config.RELEVANCE_THRESHOLD and score >= best - Config.RELEVANCE_DROP_OFF
+        ]
+        logger.info(
+            f"Recuperação: {len(docs)}/{len(scored)} chunks relevantes "
+            f"(melhor similaridade: {best:.3f}, limiar: {Config.RELEVANCE_THRESHOLD})"
         )
+        return docs
 
     @measure_time
     def rewrite_question(self, question: str) -> str:
-        """Reescreve a pergunta do usuário para otimizar a busca."""
-        prompt = ChatPromptTemplate.from_template(Config.REWRITE_PROMPT)
-        chain = prompt | self.llm | StrOutputParser()
-        return chain.invoke({"question": question})
+        """Reescreve a pergunta do usuário para otimizar a busca (com cache LRU)."""
+        return self._rewrite_cache.get_or_compute(
+            question, lambda: self.rewrite_chain.invoke({"question": question})
+        )
+
+    def cache_stats(self) -> dict:
+        """Contadores de acerto dos caches de reescrita e de embeddings de consultas."""
+        return {
+            "rewrite": self._rewrite_cache.stats(),
+            "query_embedding": self.embeddings.cache.stats(),
+        }
 
     @measure_time
-    def query(self, question: str) -> str:
-        logger.info(f"Recebendo pergunta: '{question}'")
+    def query(self, question: str, priority: Priority = Priority.INTERACTIVE, prewarm: bool = False) -> str:
+        # O pré-aquecimento usa outra mensagem para não inflar a contagem de perguntas frequentes
+        if prewarm:
+            logger.info(f"Pré-aquecendo pergunta: '{question}'")
+        else:
+            logger.info(f"Recebendo pergunta: '{question}'")
+        generation = self._index_generation
         
         # Verificar Cache
         current_time = time.time()
@@ -96,25 +202,42 @@ class RAGService:
         else:
             logger.info("Cache MISS: Processando nova pergunta.")
             
-        # Executar Chain
-        logger.info(f"Pergunta original: '{question}'")
-        question_rewrite = self.rewrite_question(question)
+        # Executar Chain (lança OverloadedError se não houver vaga a tempo)
+        with self.admission.slot(priority):
+            logger.info(f"Pergunta original: '{question}'")
+            question_rewrite = self.rewrite_question(question)
 
-        logger.info(f"Pergunta reescrita: '{question_rewrite}'")
+            logger.info(f"Pergunta reescrita: '{question_rewrite}'")
 
-        response = self.chain.invoke(question_rewrite)
+            docs = self.retrieve(question_rewrite)
+            if not docs:
+                logger.info("Nenhum chunk relevante encontrado: retornando resposta padrão sem chamar o LLM.")
+                response = Config.NOT_FOUND_ANSWER
+            else:
+                response = self.chain.invoke({
+                    "context": self._format_docs(docs),
+                    "question": question_rewrite
+                })
         
         # Salvar no Cache
-        self._cache[question] = (response, current_time)
-        logger.info("Resposta gerada e armazenada no cache.")
+        if generation == self._index_generation:
+            self._cache[question] = (response, current_time)
+            logger.info("Resposta gerada e armazenada no cache.")
+        else:
+            logger.info("Índice recarregado durante a pergunta: resposta não armazenada no cache.")
         
         return response
 
     @measure_time
-    def reload_index(self):
-        """Recarrega o índice do disco e limpa o cache."""
+    def reload_index(self, prewarm: bool = Config.CACHE_PREWARM_ON_RELOAD):
+        """Recarrega o índice do disco, limpa o cache e opcionalmente o pré-aquece."""
         logger.info("Solicitação de recarga de índice...")
+        self.cache_warmer.stop()
         self.vector_store = self._load_vector_store()
         self.chain = self._build_chain()
+        self._index_generation += 1
         self._cache.clear()  # Importante limpar o cache se os dados mudaram
         logger.info("Índice recarregado e cache limpo com sucesso.")
+        
+        if prewarm:
+            self.cache_warmer.start()
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+from typing import Dict, List, Optional
+import numpy as np
+import faiss
+
+# Importar módulos do projeto
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.config import Config
+from src.quantization import FULL_VECTORS_FILE, PQ_MIN_TRAINING_POINTS, build_compressed_index, rescore
+from src.logger import setup_logger
+
+logger = setup_logger("QuantizationBenchmark")
+
+# Variantes comparadas com o índice plano float32: (método, dimensão reduzida)
+VARIANTS = [
+    ("fp16", None),
+    ("sq8", None),
+    ("pq", None),
+    ("sq8", 256),
+    ("pq", 256),
+]
+
+
+class QuantizationBenchmark:
+    def __init__(self, n_queries: int = 200, k: int = Config.RETRIEVER_K):
+        self.n_queries = n_queries
+        self.k = k
+        self.vectors = self.load_vectors()
+
+    def load_vectors(self) -> np.ndarray:
+        """Carrega os vetores float32 do índice salvo (do vectors.npy ou do próprio índice plano)."""
+        full_vectors_path = os.path.join(Config.VECTOR_STORE_PATH, FULL_VECTORS_FILE)
+        if os.path.exists(full_vectors_path):
+            logger.info(f"Carregando vetores de {full_vectors_path}...")
+            return np.load(full_vectors_path)
+
+        index = faiss.read_index(os.path.join(Config.VECTOR_STORE_PATH, "index.faiss"))
+        logger.info(f"Reconstruindo {index.ntotal} vetores do índice plano...")
+        return index.reconstruct_n(0, index.ntotal)
+
+    def make_queries(self) -> np.ndarray:
+        """Gera consultas a partir de vetores do índice com ruído, simulando perguntas próximas dos chunks."""
+        rng = np.random.default_rng(42)
+        sample = self.vectors[rng.choice(len(self.vectors), min(self.n_queries, len(self.vectors)), replace=False)]
+        queries = sample + rng.normal(scale=0.05, size=sample.shape).astype(np.float32)
+        return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+    @staticmethod
+    def index_size(index: faiss.Index) -> int:
+        return len(faiss.serialize_index(index))
+
+    @staticmethod
+    def recall(found: List[np.ndarray], truth: np.ndarray) -> float:
+        hits = sum(len(set(f.tolist()) & set(t.tolist())) for f, t in zip(found, truth))
+        return hits / truth.size
+
+    def run_variant(self, index: faiss.Index, queries: np.ndarray, truth: np.ndarray,
+                    use_rescore: bool) -> Dict:
+        found = []
+        start_time = time.time()
+        for query in queries:
+            if use_rescore:
+                _, ids = rescore(index, self.vectors, query, self.k, Config.RESCORE_FACTOR)
+            else:
+                _, ids = index.search(query.reshape(1, -1), self.k)
+                ids = ids[0]
+            found.append(ids)
+        latency = (time.time() - start_time) / len(queries) * 1000
+        return {"latency_ms": latency, "recall": self.recall(found, truth)}
+
+    def run(self) -> List[Dict]:
+        queries = self.make_queries()
+        logger.info(f"Benchmark com {len(self.vectors)} vetores, {len(queries)} consultas, k={self.k}.")
+
+        flat = faiss.IndexFlatL2(self.vectors.shape[1])
+        flat.add(self.vectors)
+        _, truth = flat.search(queries, self.k)
+
+        baseline = self.run_variant(flat, queries, truth, use_rescore=False)
+        results = [{
+            "variant": "flat float32",
+            "bytes_per_vector": self.vectors.shape[1] * 4,
+            "index_mb": self.index_size(flat) / 1024 ** 2,
+            "latency_ms": baseline["latency_ms"],
+            "recall": baseline["recall"],
+            "rescored_latency_ms": None,
+            "rescored_recall": None,
+        }]
+
+        for method, reduced_dim in VARIANTS:
+            name = f"{method}" + (f" + PCA{reduced_dim}" if reduced_dim else "")
+            if method == "pq" and len(self.vectors) < PQ_MIN_TRAINING_POINTS:
+                # build_compressed_index trocaria por sq8 e o relatório rotularia errado
+                logger.info(f"Variante '{name}' ignorada: menos de {PQ_MIN_TRAINING_POINTS} vetores para treinar o PQ.")
+                continue
+            try:
+                index = build_compressed_index(self.vectors, method, reduced_dim)
+            except Exception as e:
+                logger.error(f"Variante '{name}' ignorada: {e}")
+                continue
+
+            plain = self.run_variant(index, queries, truth, use_rescore=False)
+            rescored = self.run_variant(index, queries, truth, use_rescore=True)
+            results.append({
+                "variant": name,
+                "bytes_per_vector": index.sa_code_size(),
+                "index_mb": self.index_size(index) / 1024 ** 2,
+                "latency_ms": plain["latency_ms"],
+                "recall": plain["recall"],
+                "rescored_latency_ms": rescored["latency_ms"],
+                "rescored_recall": rescored["recall"],
+            })
+            logger.info(f"{name}: recall {plain['recall']:.3f} -> {rescored['recall']:.3f} com rescoring")
+
+        self.save_report(results)
+        return results
+
+    def save_report(self, results: List[Dict]):
+        """Salva o relatório em JSON e Markdown."""
+        os.makedirs("tests/reports", exist_ok=True)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+
+        json_path = f"tests/reports/quantization_{timestamp}.json"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "summary": {
+                    "vectors": len(self.vectors),
+                    "dimension": int(self.vectors.shape[1]),
+                    "queries": self.n_queries,
+                    "k": self.k,
+                    "rescore_factor": Config.RESCORE_FACTOR,
+                    "timestamp": timestamp
+                },
+                "details": results
+            }, f, indent=4, ensure_ascii=False)
+
+        def fmt(value: Optional[float], spec: str) -> str:
+            return "-" if value is None else format(value, spec)
+
+        md_path = f"tests/reports/quantization_{timestamp}.md"
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(f"# Benchmark de Quantização - {timestamp}\n\n")
+            f.write(f"**Vetores:** {len(self.vectors)} x {self.vectors.shape[1]}\n")
+            f.write(f"**k:** {self.k} | **RESCORE_FACTOR:** {Config.RESCORE_FACTOR}\n\n")
+            f.write("| Variante | Bytes/vetor | Índice (MB) | Latência (ms) | Recall@k | Latência c/ rescoring (ms) | Recall@k c/ rescoring |\n")
+            f.write("|---|---|---|---|---|---|---|\n")
+            for r in results:
+                f.write(
+                    f"| {r['variant']} | {r['bytes_per_vector']} | {r['index_mb']:.2f} "
+                    f"| {r['latency_ms']:.3f} | {r['recall']:.3f} "
+                    f"| {fmt(r['rescored_latency_ms'], '.3f')} | {fmt(r['rescored_recall'], '.3f')} |\n"
+                )
+
+        logger.info(f"Relatório salvo em:\n - {json_path}\n - {md_path}")
+        print(f"\n✅ Benchmark concluído! Relatório em: {md_path}")
+
+
+def main():
+    try:
+        QuantizationBenchmark().run()
+    except Exception as e:
+        logger.critical(f"Erro fatal no benchmark: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,6 @@ import json
 import random
 import time
 from typing import List, Dict
-from langchain_ollama.llms import OllamaLLM
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
@@ -11,8 +10,8 @@ from pydantic import BaseModel, Field
 # Importar módulos do projeto
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.config import Config
 from src.rag_engine import RAGService
+from src.ollama_client import create_llm
 from src.logger import setup_logger
 
 logger = setup_logger("Evaluation")
@@ -31,7 +30,7 @@ class EvaluationResult(BaseModel):
 
 class TestSuite:
     def __init__(self):
-        self.llm = OllamaLLM(model=Config.LLM_MODEL, temperature=0.7)
+        self.llm = create_llm(temperature=0.7)
         self.rag = RAGService()
         
     def load_random_chunks(self, n_chunks: int = 5) -> List[str]:
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+
+# Importar módulos do projeto
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.admission import AdmissionController, OverloadedError, Priority
+
+
+def wait_until(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condição não satisfeita a tempo.")
+        time.sleep(0.005)
+
+
+class Scenario:
+    """Ocupa a única vaga e enfileira requisições, registrando a ordem de atendimento e os erros."""
+
+    def __init__(self, max_queue: int = 5, timeout: float = 5.0):
+        self.controller = AdmissionController(max_concurrency=1, max_queue=max_queue, timeout=timeout)
+        self.order = []
+        self.errors = {}
+        self.threads = []
+        self.release = threading.Event()
+
+        holder = threading.Thread(target=self._hold)
+        holder.start()
+        self.threads.append(holder)
+        wait_until(lambda: self.controller.stats()["in_flight"] == 1)
+
+    def _hold(self):
+        with self.controller.slot(Priority.INTERACTIVE):
+            self.release.wait()
+
+    def _request(self, name: str, priority: Priority, timeout):
+        try:
+            with self.controller.slot(priority, timeout=timeout):
+                self.order.append(name)
+        except OverloadedError as e:
+            self.errors[name] = e
+
+    def enqueue(self, name: str, priority: Priority, timeout=None):
+        """Enfileira uma requisição e espera até ela entrar na fila (ou ser rejeitada)."""
+        before = self.controller.stats()
+        handled = before["queue_depth"] + before["rejected_queue_full"] + before["rejected_deadline"]
+        thread = threading.Thread(target=self._request, args=(name, priority, timeout))
+        thread.start()
+        self.threads.append(thread)
+        wait_until(lambda: sum(
+            self.controller.stats()[key] for key in ("queue_depth", "rejected_queue_full", "rejected_deadline")
+        ) > handled)
+
+    def finish(self):
+        self.release.set()
+        for thread in self.threads:
+            thread.join(timeout=5)
+
+
+def test_interactive_is_served_before_batch():
+    scenario = Scenario()
+    scenario.enqueue("batch-1", Priority.BATCH)
+    scenario.enqueue("batch-2", Priority.BATCH)
+    scenario.enqueue("interactive", Priority.INTERACTIVE)
+    scenario.finish()
+
+    assert scenario.order == ["interactive", "batch-1", "batch-2"]
+    assert not scenario.errors
+
+
+def test_full_queue_evicts_newest_batch_for_interactive():
+    scenario = Scenario(max_queue=2)
+    scenario.enqueue("batch-1", Priority.BATCH)
+    scenario.enqueue("batch-2", Priority.BATCH)
+    scenario.enqueue("interactive", Priority.INTERACTIVE)
+    wait_until(lambda: "batch-2" in scenario.errors)
+    scenario.finish()
+
+    assert scenario.errors["batch-2"].status_code == 429
+    assert scenario.order == ["interactive", "batch-1"]
+    assert scenario.controller.stats()["evicted_batch"] == 1
+
+
+def test_full_queue_rejects_batch_with_429():
+    scenario = Scenario(max_queue=1)
+    scenario.enqueue("interactive", Priority.INTERACTIVE)
+    scenario.enqueue("batch", Priority.BATCH)
+    scenario.finish()
+
+    assert scenario.errors["batch"].status_code == 429
+    assert scenario.order == ["interactive"]
+
+
+def test_deadline_rejection_returns_503():
+    scenario = Scenario()
+    scenario.enqueue("late", Priority.INTERACTIVE, timeout=0.05)
+    wait_until(lambda: "late" in scenario.errors)
+    scenario.finish()
+
+    error = scenario.errors["late"]
+    assert error.status_code == 503
+    assert error.retry_after >= 1
+    assert scenario.controller.stats()["queue_depth"] == 0
+    assert "late" not in scenario.order
+
+
+def test_deadline_estimate_ignores_batch_waiters_behind_interactive():
+    scenario = Scenario(timeout=30)
+    # Cada atendimento leva ~10s: três BATCH na fila somariam 40s, acima do prazo de 30s
+    scenario.controller._avg_service_time = 10.0
+    scenario.enqueue("batch-1", Priority.BATCH)
+    scenario.enqueue("batch-2", Priority.BATCH)
+    scenario.enqueue("batch-3", Priority.BATCH)
+    scenario.enqueue("interactive", Priority.INTERACTIVE)
+
+    # Retry-After também usa a posição real: um novo INTERACTIVE ficaria atrás só do atual
+    assert scenario.controller._retry_after(Priority.INTERACTIVE) == 20
+    assert scenario.controller._retry_after(Priority.BATCH) == 50
+    scenario.finish()
+
+    assert "interactive" not in scenario.errors
+    assert scenario.order[0] == "interactive"